@@ -0,0 +1,5 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+# See README.md: the built module shadows jsontopyobj.py until rebuilt or removed.
+setup(ext_modules=cythonize("jsontopyobj.py", language_level=3))
@@ -1,31 +1,103 @@
-import re
-import xmltodict
-import json
+import os
 
+from lxml import etree
+import orjson
 
-def parse_xml_to_json(xml_file):
+_XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def _attribute_name(name, nsmap):
+    # Turn lxml's "{uri}local" back into the "prefix:local" form xmltodict keeps
+    qname = etree.QName(name)
+    if qname.namespace is None:
+        return qname.localname
+    if qname.namespace == _XML_NAMESPACE:
+        return "xml:" + qname.localname
+    for prefix, uri in nsmap.items():
+        if prefix is not None and uri == qname.namespace:
+            return f"{prefix}:{qname.localname}"
+    return qname.localname
+
+
+def _add_child(parent, tag, value):
+    # Repeated child elements are collected into a list, as xmltodict does
+    if tag not in parent:
+        parent[tag] = value
+    elif isinstance(parent[tag], list):
+        parent[tag].append(value)
+    else:
+        parent[tag] = [parent[tag], value]
+
+
+def parse_xml_to_dict(xml_file):
     try:
-        with open(xml_file, "r") as f:
-            xml_data = f.read()
-            json_data = xmltodict.parse(xml_data)
-        return json.dumps(json_data, indent=4)
+        # Builds the same shape as xmltodict.parse: tags and attributes keep
+        # their namespace prefix as written, namespace declarations show up
+        # as "@xmlns" attributes, attributes go under "@name", text under
+        # "#text", and elements without attributes or children become bare
+        # text. Entity references are left unexpanded and dropped, as
+        # xmltodict does by default.
+        # Each stack entry is (node, tails): tails collects the text after
+        # child elements that were already removed from the tree.
+        stack = [({}, [])]
+        declarations = {}
+        events = ("start-ns", "start", "end")
+        parser = etree.iterparse(xml_file, events=events, resolve_entities=False)
+        for event, item in parser:
+            if event == "start-ns":
+                prefix, uri = item
+                declarations["@xmlns:" + prefix if prefix else "@xmlns"] = uri
+                continue
+            elem = item
+            if event == "start":
+                node = declarations
+                declarations = {}
+                for name, value in elem.attrib.items():
+                    node["@" + _attribute_name(name, elem.nsmap)] = value
+                stack.append((node, []))
+                continue
+            node, tails = stack.pop()
+            # Text after each child element belongs to this element too
+            tails.extend(child.tail or "" for child in elem)
+            text = ((elem.text or "") + "".join(tails)).strip()
+            if not node:
+                node = text or None
+            elif text:
+                node["#text"] = text
+            tag = etree.QName(elem).localname
+            if elem.prefix:
+                tag = f"{elem.prefix}:{tag}"
+            _add_child(stack[-1][0], tag, node)
+            elem.clear(keep_tail=True)
+            # Detach processed siblings so memory stays flat while streaming,
+            # keeping their tails for the parent's text
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                stack[-1][1].append(parent[0].tail or "")
+                del parent[0]
+        return stack[0][0]
     except Exception as e:
         raise ValueError(f"Error parsing XML file: {e}")
 
 
+def to_json_string(data):
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
 def CreateJSONObject(jsondata, xml_file_path):
     if jsondata is not None:
-        j = json.dumps(jsondata)
-        jfile = re.sub(".xml", "", xml_file_path) + ".json"
-        with open(jfile, "w") as f:
-            f.write(jsondata)
+        j = orjson.dumps(jsondata, option=orjson.OPT_INDENT_2)
+        jfile = os.path.splitext(xml_file_path)[0] + ".json"
+        with open(jfile, "wb") as f:
+            f.write(j)
     else:
         print("Cannot create JSON object due to invalid XML data.")
 
 
 # Example usage
-xml_file_path = "lead1.xml"
-json_data = parse_xml_to_json(xml_file_path)
-print(json_data)
-CreateJSONObject(json_data, xml_file_path)
+if __name__ == "__main__":
+    xml_file_path = "lead1.xml"
+    json_data = parse_xml_to_dict(xml_file_path)
+    print(to_json_string(json_data))
+    CreateJSONObject(json_data, xml_file_path)
 # Use try catch and error handling